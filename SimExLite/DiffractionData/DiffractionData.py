@@ -15,6 +15,7 @@ from .SingFELFormat import SingFELFormat
 from .EMCFormat import EMCFormat
 from .CustomizedFormat import CustomizedFormat
 from . import writeemc
+from . import _poisson_kernel
 
 
 def spliterate(buf, chunk):
@@ -124,11 +125,31 @@ class DiffractionData(BaseData):
         for i, diffr_data in enumerate(tqdm(array)):
             array[i] = addGaussianNoise(diffr_data, mu, sigs_popt)
 
-    def poissonize(self):
-        """Poissonize the data array in this data class"""
+    def poissonize(self, seed=None):
+        """Poissonize the data array in this data class
+
+        Args:
+            seed (int, optional): Seed of the random number generator.
+                Defaults to None, i.e. fresh entropy from the OS.
+        """
         self.__operation_check()
         array = self.data_dict["img_array"]
-        array[:] = np.random.poisson(array)
+        # The parallel numba kernel samples on all cores; it has its own
+        # per-thread RNG streams, so seeded (reproducible) draws and dtypes
+        # numba cannot handle stay on the Generator path.
+        if (
+            seed is None
+            and _poisson_kernel.NUMBA_AVAILABLE
+            and array.dtype in (np.float32, np.float64)
+        ):
+            _poisson_kernel.poissonize_patterns(array)
+            return
+        # PCG64 Generator instead of the legacy global RandomState; drawing
+        # pattern by pattern into the existing array keeps the temporary of
+        # each draw at one pattern instead of the whole stack.
+        rng = np.random.default_rng(seed)
+        for pattern in array:
+            pattern[...] = rng.poisson(pattern)
 
     def set_array_data_type(self, data_type):
         """The the data numpy array dtype
@@ -178,8 +199,10 @@ def addBeamStop(img, stop_rad):
     """
     stop_mask = np.ones_like(img)
     center = np.array(img.shape) // 2
-    y = np.indices(img.shape)[0] - center[0]
-    x = np.indices(img.shape)[1] - center[1]
+    # Broadcast 1D axes instead of dense np.indices coordinate arrays, so
+    # only the final radius grid is materialized.
+    y = np.arange(img.shape[0]).reshape(-1, 1) - center[0]
+    x = np.arange(img.shape[1]) - center[1]
     r = np.sqrt((x * x + y * y))
     stop_mask[r <= stop_rad] = 0
     masked = img * stop_mask
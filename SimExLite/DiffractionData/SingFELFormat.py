@@ -3,6 +3,9 @@
 # This file is part of SimEx-Lite which is released under GNU General Public License v3.
 # See file LICENSE or go to <http://www.gnu.org/licenses> for full license details.
 
+import functools
+import os
+
 import h5py
 import numpy as np
 from tqdm.autonotebook import tqdm
@@ -78,17 +81,7 @@ class SingFELFormat(BaseFormat):
                 shape=(arr_size, pattern_shape[0], pattern_shape[1]),
             )
         quaternions = np.zeros((arr_size, 4))
-        if isinstance(index, (slice, str)):
-            with tqdm(total=arr_size) as progress_bar:
-                for i, (pattern, quaternion) in enumerate(
-                    ireadPattern(filename, index, poissonize)
-                ):
-                    arr[i] = pattern
-                    quaternions[i] = quaternion
-                    progress_bar.update(1)  # update progress
-        else:
-            # If only reading one pattern
-            arr[0], quaternions[0] = next(ireadPattern(filename, index, poissonize))
+        readPatterns(filename, index, poissonize, arr, quaternions)
 
         params = getParameters(filename)
         geom, distance, pixel_mask = params2extra_geom(params["geom"])
@@ -131,12 +124,147 @@ class SingFELFormat(BaseFormat):
         return object.from_file(filename, cls, key)
 
 
+def isPatternStacked(h5):
+    """Check if the ``data`` group of an open singfel h5 file holds stacked
+    pattern datasets (see :func:`rechunk_to_stack`) instead of one group per
+    pattern."""
+    data_grp = h5["data"]
+    return isinstance(data_grp[next(iter(data_grp))], h5py.Dataset)
+
+
+def readPatterns(filename, index, poissonize, arr, quaternions):
+    """Read the indexed diffraction patterns into preallocated arrays within
+    a single file-open.
+
+    For a stacked file (see :func:`rechunk_to_stack`) this is one indexed
+    HDF5 read; for the per-pattern group layout the selected datasets are
+    read back-to-back from one file handle with a 64 MiB chunk cache, instead
+    of paying the per-call overhead of one h5py access per pattern.
+
+    Args:
+        filename (str): The singfel h5 file.
+        index (slice or list): The pattern selection, already parsed by
+            :func:`SimExLite.utils.io.parseIndex`.
+        poissonize (bool): Whether to read the poissonized patterns instead
+            of the ideal ones.
+        arr (np.ndarray): Preallocated (npattern, ny, nx) pattern array.
+        quaternions (np.ndarray): Preallocated (npattern, 4) quaternion array.
+    """
+    pattern_type = getPatternType(poissonize)
+    if isinstance(index, int):
+        # parseIndex returns a plain int for single-pattern selections like
+        # index="2"; normalize it so both layout branches below can iterate.
+        index = [index]
+    with h5py.File(filename, "r", rdcc_nbytes=128 * 1024 * 1024) as h5:
+        data_grp = h5["data"]
+        if isPatternStacked(h5):
+            if isinstance(index, slice):
+                # Decode straight into the caller's buffer, skipping the
+                # intermediate result array of a fancy-indexed read.
+                data_grp[pattern_type].read_direct(arr, source_sel=np.s_[index])
+                data_grp["angle"].read_direct(quaternions, source_sel=np.s_[index])
+            else:
+                arr[...] = data_grp[pattern_type][index]
+                quaternions[...] = data_grp["angle"][index]
+            return
+        data_list = sorted(data_grp)
+        if isinstance(index, slice):
+            selected = data_list[index]
+        else:
+            selected = [data_list[i] for i in index]
+        with tqdm(total=len(selected)) as progress_bar:
+            for i, name in enumerate(selected):
+                grp = data_grp[name]
+                grp[pattern_type].read_direct(arr, dest_sel=np.s_[i])
+                grp["angle"].read_direct(quaternions, dest_sel=np.s_[i])
+                progress_bar.update(1)  # update progress
+
+
+def rechunk_to_stack(in_filename, out_filename, chunk_npatterns=32):
+    """Rewrite a per-pattern singfel file with stacked pattern datasets.
+
+    The singfel layout stores each pattern in its own ``data/0000001``-style
+    group, so bulk reads pay one h5py dataset access per pattern. This writes
+    a file where ``data/diffr``, ``data/data`` and ``data/angle`` are single
+    (npattern, ...) datasets chunked along the pattern axis, which the
+    readers of this module recognize and serve with one indexed read.
+
+    Args:
+        in_filename (str): The per-pattern singfel h5 file.
+        out_filename (str): The stacked file to write.
+        chunk_npatterns (int): Number of patterns per HDF5 chunk.
+            Defaults to 32.
+    """
+    with h5py.File(in_filename, "r") as h5_in, h5py.File(out_filename, "w") as h5_out:
+        for top_key in ["params", "misc", "info", "version"]:
+            if top_key in h5_in:
+                h5_in.copy(top_key, h5_out)
+        data_grp = h5_in["data"]
+        data_list = sorted(data_grp)
+        npattern = len(data_list)
+        out_grp = h5_out.create_group("data")
+        first = data_grp[data_list[0]]
+        for name in ["diffr", "data", "angle"]:
+            if name not in first:
+                continue
+            item_shape = first[name].shape
+            if name == "angle":
+                chunks = None
+            else:
+                chunks = (min(chunk_npatterns, npattern),) + item_shape
+            dset = out_grp.create_dataset(
+                name,
+                shape=(npattern,) + item_shape,
+                dtype=first[name].dtype,
+                chunks=chunks,
+            )
+            for i, group_name in enumerate(data_list):
+                dset[i] = data_grp[group_name][name][...]
+
+
+def getPatternCacheBytes(filename, poissonize=True):
+    """Get a chunk-cache size (in bytes) holding a few chunks of the pattern
+    dataset of a singfel file, with a floor of 16 MiB. For the per-pattern
+    group layout the datasets are read whole, so the floor is returned.
+
+    The estimate uses the cached file metadata; the ideal and poissonized
+    datasets of a stacked file share their chunking, so ``poissonize`` does
+    not change the result."""
+    metadata = getMetadata(filename)
+    chunk_nbytes = 0
+    if metadata["stacked"] and metadata["chunks"] is not None:
+        chunk_nbytes = metadata["dtype"].itemsize * int(np.prod(metadata["chunks"]))
+    return max(4 * chunk_nbytes, 16 * 1024 * 1024)
+
+
 def ireadPattern(filename, index=None, poissonize=True):
-    """Iterator for reading diffraction patterns from a singfel file."""
+    """Iterator for reading diffraction patterns from a singfel file.
+
+    The patterns are yielded one at a time, so the peak memory stays at one
+    pattern (plus the HDF5 chunk cache) regardless of the dataset size. The
+    chunk cache is sized to the chunks of the pattern dataset, so for a
+    stacked file (see :func:`rechunk_to_stack`) each multi-pattern chunk is
+    fetched from disk only once while the iteration walks through it."""
     index = parseIndex(index)
+    if isinstance(index, int):
+        # parseIndex returns a plain int for single-pattern selections like
+        # index="2"; normalize it to a slice so both layout branches below
+        # iterate over a one-pattern selection.
+        index = slice(index, index + 1)
     pattern_type = getPatternType(poissonize)
-    with h5py.File(filename, "r") as h5:
+    rdcc_nbytes = getPatternCacheBytes(filename, poissonize)
+    with h5py.File(filename, "r", rdcc_nbytes=rdcc_nbytes) as h5:
         data_grp = h5["data"]
+        if isPatternStacked(h5):
+            dset = data_grp[pattern_type]
+            angles = data_grp["angle"]
+            if isinstance(index, slice):
+                indices = range(dset.shape[0])[index]
+            else:
+                indices = index
+            for i in indices:
+                yield dset[i], angles[i]
+            return
         data_list = list(data_grp)
         data_list.sort()
         indices = data_list[index]
@@ -162,21 +290,66 @@ def getPatternType(poissonize: bool) -> str:
     return pattern_type
 
 
+@functools.lru_cache(maxsize=16)
+def _readMetadata(filename, mtime):
+    """Collect the small metadata of a singfel file in one file-open.
+
+    ``mtime`` is part of the cache key, so a rewritten file gets a fresh
+    entry; callers go through :func:`getMetadata`.
+    """
+    with h5py.File(filename, "r") as h5:
+        data_grp = h5["data"]
+        stacked = isPatternStacked(h5)
+        if stacked:
+            try:
+                dset = data_grp["diffr"]
+            except KeyError:
+                dset = data_grp["data"]
+            shape = dset.shape[1:]
+            total = dset.shape[0]
+        else:
+            group_name = next(iter(data_grp))
+            try:
+                dset = data_grp[group_name]["diffr"]
+            except KeyError:
+                dset = data_grp[group_name]["data"]
+            shape = dset.shape
+            total = len(data_grp)
+        return {
+            "stacked": stacked,
+            "shape": shape,
+            "total": total,
+            "dtype": dset.dtype,
+            "chunks": dset.chunks,
+        }
+
+
+def getMetadata(filename):
+    """Get the pattern metadata of a singfel file, cached per file.
+
+    Opening an HDF5 file costs a few milliseconds; helpers like
+    :func:`getPatternShape` and :func:`getPatternTotal` are often called
+    back-to-back on the same file, so the metadata of recently seen files is
+    served from a small cache keyed on (path, mtime).
+
+    Args:
+        filename (str): The singfel h5 file.
+
+    Returns:
+        dict: The ``stacked``, ``shape``, ``total``, ``dtype`` and
+        ``chunks`` metadata of the pattern data.
+    """
+    return _readMetadata(str(filename), os.path.getmtime(filename))
+
+
 def getPatternShape(filename):
     """Get the shape of diffraction patterns in the hdf5 file"""
-    with h5py.File(filename, "r") as h5:
-        group_name = list(h5["data"])[0]
-        try:
-            return h5["data"][group_name]["diffr"].shape
-        except KeyError:
-            return h5["data"][group_name]["data"].shape
+    return getMetadata(filename)["shape"]
 
 
 def getPatternTotal(filename):
     """Get the total number of diffraction patterns in the hdf5 file"""
-    with h5py.File(filename, "r") as h5:
-        npattern = len(h5["data"])
-    return npattern
+    return getMetadata(filename)["total"]
 
 
 def getParameters(filename):
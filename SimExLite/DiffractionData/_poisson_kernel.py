@@ -0,0 +1,52 @@
+""":module _poisson_kernel: Numba-parallel poissonization of pattern stacks."""
+import numpy as np
+
+# Numba is necessary for the parallel kernel, but it's not a hard dependency
+# of SimExLite; callers fall back to the NumPy Generator when it is missing.
+try:
+    from numba import guvectorize
+
+    NUMBA_AVAILABLE = True
+except ModuleNotFoundError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @guvectorize(
+        [
+            "void(float32[:, :], float32[:, :])",
+            "void(float64[:, :], float64[:, :])",
+        ],
+        "(n,m)->(n,m)",
+        target="parallel",
+        nopython=True,
+        cache=True,
+    )
+    def _poisson_pattern(pattern, out):
+        """Draw a Poisson sample for every pixel of one pattern; the
+        ``parallel`` target maps the patterns of a stack onto threads, each
+        with its own numba RNG stream."""
+        for i in range(pattern.shape[0]):
+            for j in range(pattern.shape[1]):
+                out[i, j] = np.random.poisson(pattern[i, j])
+
+
+def poissonize_patterns(array):
+    """Poissonize a (npattern, ny, nx) float stack in place.
+
+    Unlike ``np.random.poisson``, which draws single-threaded under the GIL,
+    the guvectorized kernel samples the patterns on all cores. Each pixel is
+    read before its slot is written, so sampling into the input array is
+    safe.
+
+    Args:
+        array (np.ndarray): The float32/float64 pattern stack, modified in
+            place.
+    """
+    if not NUMBA_AVAILABLE:
+        raise ModuleNotFoundError(
+            'Cannot find the "numba" module, which is required for the '
+            "parallel poissonization kernel."
+        )
+    _poisson_pattern(array, out=array)
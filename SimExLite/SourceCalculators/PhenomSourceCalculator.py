@@ -1,10 +1,14 @@
 """:module PhenomCalculator: Module that holds the PhenomCalculator class.  """
+import functools
+
 import h5py
 import numpy as np
 from pathlib import Path
 from SimExLite.utils.Logger import setLogger
-from SimExLite.WavefrontData import WavefrontData, WPGFormat
+from SimExLite.WavefrontData import WavefrontData, WPGFormat, WPGZarrFormat
+from SimExLite.WavefrontData.WPGZarrFormat import write_array as _write_zarr_array
 from SimExLite.utils.Logger import setLogger
+from SimExLite.SourceCalculators import _phenom_kernel
 from libpyvinyl import BaseCalculator, CalculatorParameters
 
 
@@ -19,16 +23,567 @@ except ModuleNotFoundError:
     WPG_AVAILABLE = False
 
 try:
-    from phenom.wpg import wpg_converter
     from phenom.source import SASE_Source
+    from phenom.spectrum import linear_SASE_spectrum
+    from phenom.utils import e2wav
 
     PHENOM_AVAILABLE = True
 except ModuleNotFoundError:
     PHENOM_AVAILABLE = False
 
+# CuPy is only needed for the optional GPU evaluation of the pulse field.
+try:
+    import cupy as cp
+
+    CUPY_AVAILABLE = True
+except ModuleNotFoundError:
+    CUPY_AVAILABLE = False
+
+# zarr is only needed for the optional zarr output backend.
+try:
+    import zarr
+
+    ZARR_AVAILABLE = True
+except ModuleNotFoundError:
+    ZARR_AVAILABLE = False
+
+# joblib is only needed to distribute multi-shot runs over processes.
+try:
+    from joblib import Parallel, delayed
+
+    JOBLIB_AVAILABLE = True
+except ModuleNotFoundError:
+    JOBLIB_AVAILABLE = False
+
 logger = setLogger("PhenomSourceCalculator")
 
 
+def _sase_pulse_broadcast(
+    x,
+    y,
+    t,
+    photon_energy,
+    pulse_energy,
+    pulse_duration,
+    bandwidth,
+    sigma,
+    div,
+    x0,
+    y0,
+    t0,
+    theta_x,
+    theta_y,
+    use_gpu=False,
+):
+    """SASE pulse model evaluated with broadcast 1D axes.
+
+    This reproduces :func:`phenom.source.sase_pulse` but skips the dense
+    ``np.meshgrid`` coordinate arrays: the 1D x/y axes are reshaped to
+    ``(1, nx)`` and ``(ny, 1)`` and NumPy broadcasting materializes only the
+    final 2D/3D results, so the intermediate coordinate grids and the
+    redundant squaring of tiled axes are avoided.
+
+    The parameters are identical to those of :func:`phenom.source.sase_pulse`,
+    plus ``use_gpu`` to evaluate the field with CuPy when it is available.
+    """
+    tfield = linear_SASE_spectrum(
+        t,
+        pulse_duration=pulse_duration,
+        photon_energy=photon_energy,
+        bandwidth=bandwidth,
+        t0=t0,
+    )
+
+    if use_gpu and not CUPY_AVAILABLE:
+        logger.warning(
+            'Cannot find the "cupy" module, computing the SASE field on the CPU.'
+        )
+    if use_gpu and CUPY_AVAILABLE:
+        return _sase_pulse_gpu(
+            x, y, t, tfield, photon_energy, pulse_energy, sigma, div, x0, y0,
+            theta_x, theta_y,
+        )
+
+    if _phenom_kernel.NUMBA_AVAILABLE:
+        # Fused parallel kernel: each output voxel is computed once in
+        # registers, with no full-size intermediates.
+        return _phenom_kernel.sase_field(
+            x,
+            y,
+            t,
+            tfield,
+            pulse_energy=pulse_energy,
+            sigma=sigma,
+            div=div,
+            x0=x0,
+            y0=y0,
+            theta_x=theta_x,
+            theta_y=theta_y,
+            wavelength=e2wav(photon_energy),
+        )
+
+    # Broadcast axes oriented like np.meshgrid(x, y): arrays of shape (ny, nx).
+    xb = x.reshape(1, -1)
+    yb = y.reshape(-1, 1)
+
+    # Complex gaussian beam (phenom.gaussian.complex_gaussian_beam).
+    r2 = (xb - x0) ** 2 + (yb - y0) ** 2
+    R = sigma / div
+    k = 2 * np.pi / e2wav(photon_energy)
+    sfield = np.sqrt(pulse_energy) * np.exp(-r2 / (2 * sigma**2) - 1j * k * r2 / (4 * R))
+    sfield /= np.sqrt(np.sum(abs(sfield) ** 2))
+
+    # Wavefront tilt (phenom.wavefront_tools.wavefront_tilt). For zero pointing
+    # angles the tilt is unity everywhere and only its normalization survives.
+    if theta_x == 0.0 and theta_y == 0.0:
+        sfield = sfield / np.sqrt(x.size * y.size)
+    else:
+        kx = 2 * np.pi * np.sin(theta_x) / e2wav(photon_energy)
+        ky = 2 * np.pi * np.sin(theta_y) / e2wav(photon_energy)
+        tilt = np.exp(1j * (kx * xb + ky * yb))
+        tilt /= np.sqrt(np.sum(abs(tilt**2)))
+        sfield = sfield * tilt
+
+    efield = sfield[:, :, np.newaxis] * tfield
+    efield /= np.sqrt(np.sum(abs(efield) ** 2) * np.ptp(x) * np.ptp(y) * np.ptp(t))
+    efield *= pulse_energy
+
+    return efield
+
+
+def _sase_pulse_gpu(
+    x, y, t, tfield, photon_energy, pulse_energy, sigma, div, x0, y0, theta_x, theta_y
+):
+    """Evaluate the SASE field on the GPU with CuPy.
+
+    The math mirrors the broadcast NumPy path of
+    :func:`_sase_pulse_broadcast`; only the temporal spectrum ``tfield``
+    stays on the host (it is 1D and cheap) and a single device-to-host copy
+    returns the final field.
+    """
+    xb = cp.asarray(x).reshape(1, -1)
+    yb = cp.asarray(y).reshape(-1, 1)
+
+    r2 = (xb - x0) ** 2 + (yb - y0) ** 2
+    R = sigma / div
+    k = 2 * np.pi / e2wav(photon_energy)
+    sfield = cp.sqrt(pulse_energy) * cp.exp(
+        -r2 / (2 * sigma**2) - 1j * k * r2 / (4 * R)
+    )
+    sfield /= cp.sqrt(cp.sum(cp.abs(sfield) ** 2))
+
+    if theta_x == 0.0 and theta_y == 0.0:
+        sfield = sfield / np.sqrt(x.size * y.size)
+    else:
+        kx = 2 * np.pi * np.sin(theta_x) / e2wav(photon_energy)
+        ky = 2 * np.pi * np.sin(theta_y) / e2wav(photon_energy)
+        tilt = cp.exp(1j * (kx * xb + ky * yb))
+        tilt /= cp.sqrt(cp.sum(cp.abs(tilt) ** 2))
+        sfield = sfield * tilt
+
+    efield = sfield[:, :, cp.newaxis] * cp.asarray(tfield)
+    efield /= cp.sqrt(cp.sum(cp.abs(efield) ** 2) * np.ptp(x) * np.ptp(y) * np.ptp(t))
+    efield *= pulse_energy
+
+    return cp.asnumpy(efield)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_axes(range_x, num_x, range_y, num_y, range_t, num_t):
+    """Build the 1D mesh axes, memoized on the mesh parameters.
+
+    Parameter sweeps (e.g. over ``photon_energy`` or ``pulse_energy``)
+    re-run ``backengine`` with an unchanged mesh; caching skips the
+    repeated allocations. The ranges must be passed as tuples so they are
+    hashable, and the returned arrays must be treated as read-only.
+
+    Args:
+        range_x, range_y (tuple): The (start, end) mesh ranges. [m]
+        range_t (tuple): The (start, end) temporal range. [s]
+        num_x, num_y, num_t (int): Number of mesh points per direction.
+
+    Returns:
+        tuple: The (x, y, t) 1D axes.
+    """
+    x = np.linspace(range_x[0], range_x[1], num_x)
+    y = np.linspace(range_y[0], range_y[1], num_y)
+    t = np.linspace(range_t[0], range_t[1], num_t)
+    return x, y, t
+
+
+def _wavefront_from_array(efield, x, y, t, photon_energy):
+    """Build a WPG wavefront from an in-memory complex field.
+
+    This is :func:`phenom.wpg.wpg_converter` without the HDF5 round-trip: the
+    (ny, nx, nt) complex field stays in memory instead of being serialized by
+    ``generate_pulses`` and read back from ``sase_field.h5``.
+
+    Args:
+        efield (np.ndarray): The complex SASE field.
+        x, y, t (np.ndarray): The 1D mesh axes of the field.
+        photon_energy (float): The central photon energy. [eV]
+
+    Returns:
+        Wavefront: The WPG wavefront holding the field.
+    """
+    nx, ny, nt = efield.shape
+    # Match the precision of the field, e.g. float32 for a complex64 field.
+    real_dtype = np.empty(0, dtype=efield.dtype).real.dtype
+
+    wfr = Wavefront()
+
+    # Setup E-field. Both polarizations must be allocated before the SRW
+    # representation change below: the arrays back SRWLWfr.arEx/arEy, which
+    # otherwise still hold the constructor defaults while the mesh already
+    # declares nx*ny*nSlices points. The horizontal array is overwritten
+    # with the filled field afterwards.
+    wfr.data.arrEhor = np.zeros(shape=(nx, ny, nt, 2), dtype=real_dtype)
+    wfr.data.arrEver = np.zeros(shape=(nx, ny, nt, 2), dtype=real_dtype)
+
+    wfr.params.wEFieldUnit = "sqrt(W/mm^2)"
+    wfr.params.photonEnergy = photon_energy
+
+    wfr.params.Mesh.nSlices = nt
+    wfr.params.Mesh.nx = nx
+    wfr.params.Mesh.ny = ny
+
+    wfr.params.Mesh.sliceMin = np.min(t)
+    wfr.params.Mesh.sliceMax = np.max(t)
+
+    wfr.params.wDomain = "time"
+
+    srwlpy.SetRepresElecField(wfr._srwl_wf, "frequency")
+
+    wfr.params.Mesh.xMin = np.min(x)
+    wfr.params.Mesh.xMax = np.max(x)
+    wfr.params.Mesh.yMin = np.min(y)
+    wfr.params.Mesh.yMax = np.max(y)
+
+    wfr.params.Rx = 1
+    wfr.params.Ry = 1
+
+    arrEhor = np.empty(efield.shape + (2,), dtype=real_dtype)
+    arrEhor[:, :, :, 0] = efield.real
+    arrEhor[:, :, :, 1] = efield.imag
+    wfr.data.arrEhor = arrEhor
+
+    return wfr
+
+
+def _run_one_shot(
+    pulse_params,
+    x,
+    y,
+    t,
+    dtype,
+    out_path,
+    chunk_shape,
+    compression,
+    fast_write,
+    backend,
+    use_gpu,
+    seed,
+):
+    """Evaluate and store a single SASE shot.
+
+    This is the unit of work of the per-shot parallelization in
+    ``backengine``: shots of a stochastic SASE ensemble are independent, so
+    each one evaluates its own pulse (seeded for distinct spectral phases)
+    and writes its own wavefront file.
+
+    Args:
+        pulse_params (dict): The per-pulse parameters of the phenom source.
+        x, y, t (np.ndarray): The 1D mesh axes.
+        dtype (str): The dtype the field is stored at, e.g. "complex64".
+        out_path (str): The wavefront file of this shot.
+        chunk_shape (tuple): Chunk shape of the field datasets, or None.
+        compression (str): h5py compression filter, or None.
+        fast_write (bool): Write directly with h5py instead of WPG's
+            ``store_hdf5``. Ignored by the zarr backend.
+        backend (str): Storage backend of the shot, "hdf5" or "zarr".
+        use_gpu (bool): Evaluate the field with CuPy when available.
+        seed (int): Seed for the spectral phases of this shot.
+
+    Returns:
+        str: ``out_path``.
+    """
+    if seed is not None:
+        np.random.seed(seed)
+    efield = _sase_pulse_broadcast(
+        x=x,
+        y=y,
+        t=t,
+        photon_energy=pulse_params["photon_energy"],
+        pulse_energy=pulse_params["pulse_energy"],
+        pulse_duration=pulse_params["pulse_duration"],
+        bandwidth=pulse_params["bandwidth"],
+        sigma=pulse_params["sigma"],
+        div=pulse_params["div"],
+        x0=pulse_params["x0"],
+        y0=pulse_params["y0"],
+        t0=pulse_params["t0"],
+        theta_x=pulse_params["theta_x"],
+        theta_y=pulse_params["theta_y"],
+        use_gpu=use_gpu,
+    )
+    efield = efield.astype(np.dtype(dtype), copy=False)
+    wfr = _wavefront_from_array(efield, x, y, t, pulse_params["photon_energy"])
+    if backend == "zarr":
+        _write_wavefront_zarr(
+            wfr, out_path, chunk_shape, "none" if compression is None else "blosc"
+        )
+    elif fast_write:
+        _write_wavefront_h5(wfr, out_path, chunk_shape, compression)
+    else:
+        wfr.store_hdf5(out_path)
+        _rechunk_time_sliced(
+            out_path, ["data/arrEhor", "data/arrEver"], chunk_shape, compression
+        )
+    return out_path
+
+
+# Scalar metadata written by _write_wavefront_h5, matching the fields of
+# WPG's Wavefront.store_hdf5 output that WPGFormat and WPG itself read back.
+_WAVEFRONT_PARAMS = (
+    "photonEnergy",
+    "wDomain",
+    "wSpace",
+    "wEFieldUnit",
+    "wFloatType",
+    "Rx",
+    "Ry",
+    "dRx",
+    "dRy",
+    "xCentre",
+    "yCentre",
+    "nval",
+)
+_WAVEFRONT_MESH_PARAMS = (
+    "nx",
+    "ny",
+    "nSlices",
+    "sliceMin",
+    "sliceMax",
+    "xMin",
+    "xMax",
+    "yMin",
+    "yMax",
+    "zCoord",
+    "hvx",
+    "hvy",
+    "hvz",
+    "nvx",
+    "nvy",
+    "nvz",
+    "qxMin",
+    "qxMax",
+    "qyMin",
+    "qyMax",
+)
+_WAVEFRONT_SCALAR_TYPES = (int, float, str, bytes, np.generic, np.ndarray)
+
+
+def _collect_scalars(struct, names):
+    """Collect the defined scalar metadata fields of a WPG params struct
+    into a plain dict, so they can be written in one pass."""
+    scalars = {}
+    for name in names:
+        value = getattr(struct, name, None)
+        if isinstance(value, _WAVEFRONT_SCALAR_TYPES):
+            scalars[name] = value
+    return scalars
+
+
+def _write_wavefront_h5(wfr, path, chunk_shape=None, compression=None):
+    """Write a WPG wavefront with h5py directly.
+
+    WPG's ``Wavefront.store_hdf5`` stores the electric-field arrays with the
+    default contiguous layout and creates the metadata datasets one by one
+    through its glossary machinery. This writes the same schema
+    (``data/arrEhor``/``data/arrEver`` plus the ``params`` tree read by
+    :class:`SimExLite.WavefrontData.WPGFormat`), but chunks the field arrays
+    per transverse slice for slice-wise consumers and supports an optional
+    compression filter. Metadata fields the wavefront does not define are
+    skipped.
+
+    The scalar metadata is additionally mirrored into the attributes of the
+    ``params`` and ``params/Mesh`` groups with a single ``attrs.update``
+    each: attributes live in the group's object header, so metadata-only
+    consumers can fetch all of them with one read instead of opening the
+    per-scalar datasets one by one. The datasets themselves are kept since
+    both :class:`SimExLite.WavefrontData.WPGFormat` and WPG's ``load_hdf5``
+    resolve the metadata by dataset path.
+
+    Args:
+        wfr (Wavefront): The WPG wavefront to store.
+        path (str): The output HDF5 file.
+        chunk_shape (tuple, optional): Chunk shape of the field datasets.
+            Defaults to None, which chunks per transverse slice.
+        compression (str, optional): h5py compression filter. Defaults to
+            None (no compression).
+    """
+    params = _collect_scalars(wfr.params, _WAVEFRONT_PARAMS)
+    mesh = _collect_scalars(wfr.params.Mesh, _WAVEFRONT_MESH_PARAMS)
+    with h5py.File(path, "w") as h5:
+        data_grp = h5.create_group("data")
+        for name in ("arrEhor", "arrEver"):
+            arr = np.asarray(getattr(wfr.data, name))
+            if chunk_shape is None:
+                chunks = arr.shape[:2] + (1,) * (arr.ndim - 2)
+            else:
+                chunks = tuple(chunk_shape) + (1,) * (arr.ndim - len(chunk_shape))
+            data_grp.create_dataset(
+                name, data=arr, chunks=chunks, compression=compression
+            )
+        params_grp = h5.create_group("params")
+        for name, value in params.items():
+            params_grp[name] = value
+        params_grp.attrs.update(params)
+        mesh_grp = params_grp.create_group("Mesh")
+        for name, value in mesh.items():
+            mesh_grp[name] = value
+        mesh_grp.attrs.update(mesh)
+
+
+def _write_wavefront_zarr(wfr, path, chunk_shape=None, compression="blosc"):
+    """Write a WPG wavefront as a zarr directory store.
+
+    The layout mirrors :func:`_write_wavefront_h5` and is read back by
+    :class:`SimExLite.WavefrontData.WPGZarrFormat`. Every chunk is its own
+    file in the store and Blosc compresses outside the GIL, which avoids the
+    single-writer serialization of HDF5 when many shots are written from
+    worker processes.
+
+    Args:
+        wfr (Wavefront): The WPG wavefront to store.
+        path (str): The output zarr store directory.
+        chunk_shape (tuple, optional): Chunk shape of the field arrays.
+            Defaults to None, which chunks per transverse slice.
+        compression (str, optional): "blosc" for Blosc/lz4, or "none".
+            Defaults to "blosc".
+    """
+    root = zarr.open_group(path, mode="w")
+    data_grp = root.create_group("data")
+    for name in ("arrEhor", "arrEver"):
+        arr = np.asarray(getattr(wfr.data, name))
+        _write_zarr_array(data_grp, name, arr, chunk_shape, compression)
+    params_grp = root.create_group("params")
+    params_grp.attrs.update(_collect_scalars(wfr.params, _WAVEFRONT_PARAMS))
+    mesh_grp = params_grp.create_group("Mesh")
+    mesh_grp.attrs.update(_collect_scalars(wfr.params.Mesh, _WAVEFRONT_MESH_PARAMS))
+
+
+def _write_sase_h5(path, efield, x, y, t, pulse_params, chunk_shape=None, compression=None):
+    """Write an already-evaluated pulse in the layout of phenom's
+    ``generate_pulses``, so the file can still be consumed by
+    :func:`phenom.wpg.wpg_converter`.
+
+    Args:
+        path (str): The output HDF5 file.
+        efield (np.ndarray): The complex SASE field.
+        x, y, t (np.ndarray): The 1D mesh axes of the field.
+        pulse_params (dict): The per-pulse parameters of the phenom source.
+        chunk_shape (tuple, optional): Chunk shape of the field dataset.
+            Defaults to None, which chunks per transverse slice.
+        compression (str, optional): h5py compression filter. Defaults to
+            None (no compression).
+    """
+    if chunk_shape is None:
+        chunks = efield.shape[:2] + (1,) * (efield.ndim - 2)
+    else:
+        chunks = tuple(chunk_shape) + (1,) * (efield.ndim - len(chunk_shape))
+    with h5py.File(path, "w") as hf:
+        group = hf.create_group("pulse000")
+        group.create_dataset(
+            "data", data=efield, chunks=chunks, compression=compression
+        )
+        params = group.create_group("params")
+        for key in pulse_params:
+            params.create_dataset(key, data=pulse_params[key])
+        mesh = group.create_group("mesh")
+        mesh.create_dataset("x", data=x)
+        mesh.create_dataset("y", data=y)
+        mesh.create_dataset("t", data=t)
+
+
+def _rechunk_time_sliced(path, dataset_names, chunk_shape=None, compression=None):
+    """Rewrite field datasets of an HDF5 file with cache-friendly chunking.
+
+    Both phenom's ``generate_pulses`` and WPG's ``store_hdf5`` write the field
+    datasets with the library default layout, which for large grids yields
+    either contiguous storage or tiny auto-chunks with deep B-trees. Rewrite
+    the named datasets so that one chunk holds one transverse ``(ny, nx)``
+    slice, matching the per-time-slice 2D access pattern of downstream
+    consumers and visualization.
+
+    Args:
+        path (str): The HDF5 file to modify in place.
+        dataset_names (list): HDF5 paths of the datasets to rechunk. Missing
+            names are skipped silently.
+        chunk_shape (tuple, optional): Explicit chunk shape. Trailing axes not
+            covered by the tuple are chunked with length 1. Defaults to None,
+            which chunks per transverse slice.
+        compression (str, optional): h5py compression filter, e.g. "lzf" or
+            "gzip". Defaults to None (no compression).
+    """
+    # 64 MiB chunk cache with a large prime slot count, see the h5py
+    # documentation on raw data chunk caching.
+    with h5py.File(
+        path, "r+", rdcc_nbytes=64 * 1024 * 1024, rdcc_nslots=1_000_003
+    ) as h5:
+        for name in dataset_names:
+            if name not in h5:
+                continue
+            dset = h5[name]
+            if chunk_shape is None:
+                # One (ny, nx) transverse slice per chunk; the time axis (and
+                # the real/imag pair of WPG field arrays) is split.
+                chunks = dset.shape[:2] + (1,) * (dset.ndim - 2)
+            else:
+                chunks = tuple(chunk_shape) + (1,) * (dset.ndim - len(chunk_shape))
+            if dset.chunks == chunks and compression is None:
+                continue
+            data = dset[()]
+            attributes = dict(dset.attrs)
+            del h5[name]
+            dset = h5.create_dataset(
+                name, data=data, chunks=chunks, compression=compression
+            )
+            dset.attrs.update(attributes)
+
+
+if PHENOM_AVAILABLE:
+
+    class _BroadcastSASESource(SASE_Source):
+        """A :class:`phenom.source.SASE_Source` evaluating the pulses with
+        :func:`_sase_pulse_broadcast` instead of meshgrid-based
+        :func:`phenom.source.sase_pulse`."""
+
+        # Set as an attribute by the calculator: bools cannot be handed
+        # through the SASE_Source kwargs, whose argument queue only accepts
+        # floats, arrays, lists, strings and lambdas.
+        use_gpu = False
+
+        def generate_sase_field(self, params):
+            return _sase_pulse_broadcast(
+                x=self.x,
+                y=self.y,
+                t=self.t,
+                photon_energy=params["photon_energy"],
+                pulse_energy=params["pulse_energy"],
+                pulse_duration=params["pulse_duration"],
+                bandwidth=params["bandwidth"],
+                sigma=params["sigma"],
+                div=params["div"],
+                x0=params["x0"],
+                y0=params["y0"],
+                t0=params["t0"],
+                theta_x=params["theta_x"],
+                theta_y=params["theta_y"],
+                use_gpu=self.use_gpu,
+            )
+
+
 class PhenomSourceCalculator(BaseCalculator):
     """
     Class calculating a x-ray free electron laser photon source under the gaussian assumption.
@@ -150,11 +705,98 @@ class PhenomSourceCalculator(BaseCalculator):
         )
         div.value = 2.5e-03
 
+        chunk_shape = parameters.new_parameter(
+            "chunk_shape",
+            comment='HDF5 chunk shape of the output field datasets. "auto" chunks per transverse (ny, nx) time slice.',
+        )
+        chunk_shape.value = "auto"
+
+        compression = parameters.new_parameter(
+            "compression",
+            comment='HDF5 compression filter of the output field datasets, e.g. "lzf" or "gzip". "none" disables compression.',
+        )
+        compression.value = "none"
+
+        save_intermediate = parameters.new_parameter(
+            "save_intermediate",
+            comment="Also write the intermediate phenom pulse file sase_field.h5 (for debugging).",
+        )
+        save_intermediate.value = False
+
+        fast_write = parameters.new_parameter(
+            "fast_write",
+            comment="Write wavefront.h5 directly with h5py instead of WPG's store_hdf5.",
+        )
+        fast_write.value = True
+
+        dtype = parameters.new_parameter(
+            "dtype",
+            comment='Data type of the stored field, "complex64" or "complex128".',
+        )
+        dtype.value = "complex64"
+
+        num_shots = parameters.new_parameter(
+            "num_shots",
+            comment="Number of SASE shots to generate. For more than one shot, each shot is written"
+            ' to its own "<filename>_###.h5" and the output file becomes a master file of external'
+            " links, which holds no wavefront itself: read the per-shot files individually.",
+        )
+        num_shots.value = 1
+
+        backend = parameters.new_parameter(
+            "backend",
+            comment='Storage backend of the output wavefront, "hdf5" or "zarr". The zarr backend writes'
+            " Blosc-compressed chunks that scale with parallel multi-shot writers.",
+        )
+        backend.value = "hdf5"
+
+        use_gpu = parameters.new_parameter(
+            "use_gpu",
+            comment="Evaluate the SASE field on the GPU with CuPy; falls back to the CPU when CuPy is unavailable.",
+        )
+        use_gpu.value = False
+
+        n_jobs = parameters.new_parameter(
+            "n_jobs",
+            comment="Number of processes for multi-shot generation (joblib); 1 runs serially, -1 uses all cores.",
+        )
+        n_jobs.value = 1
+
         self.parameters = parameters
 
+    def _output_paths(self):
+        """The output filename template, the formatted wavefront path and the
+        intermediate pulse-file path.
+
+        ``output_file_paths`` rebuilds the paths (including a mkdir check) on
+        every access and the key formatting re-runs per call; cache the
+        strings keyed on the directory/filename/key settings so tight sweep
+        loops over ``backengine`` don't pay for them, while later changes
+        (e.g. through an ``Instrument`` setting the base dirs) still
+        invalidate the cache.
+        """
+        cache_key = (
+            self.base_dir,
+            tuple(self.output_filenames),
+            self.output_keys[0],
+        )
+        if getattr(self, "_cached_path_key", None) != cache_key:
+            filename = self.output_file_paths[0]
+            self._cached_filename = filename
+            self._cached_out_path = filename.format(self.output_keys[0])
+            self._cached_save_loc = str(
+                Path(self.calculator_base_dir) / "sase_field.h5"
+            )
+            self._cached_path_key = cache_key
+        return self._cached_filename, self._cached_out_path, self._cached_save_loc
+
     def _ensure_unit(self, param: str, unit: str):
         """Ensure the unit is correct"""
-        return self.parameters[param].value_no_conversion.to(unit).magnitude
+        magnitude = self.parameters[param].value_no_conversion.to(unit).magnitude
+        if np.ndim(magnitude) == 0:
+            # Plain Python scalar, so that np.float64 does not leak into phenom.
+            return float(magnitude)
+        return magnitude
 
     def backengine(self):
 
@@ -169,21 +811,24 @@ class PhenomSourceCalculator(BaseCalculator):
         pulse_energy = self._ensure_unit("pulse_energy", "joule")
         photon_energy = self._ensure_unit("photon_energy", "eV")
         pulse_duration = self._ensure_unit("pulse_duration", "second")
-        bandwidth = self.parameters["spectral_bandwidth"].value
-        sigma = self.parameters["sigma"].value
-        if type(sigma) == np.float64:
-            sigma = float(sigma)
-        div = self.parameters["div"].value
+        bandwidth = float(self.parameters["spectral_bandwidth"].value)
+        sigma = float(self.parameters["sigma"].value)
+        div = float(self.parameters["div"].value)
         range_x = self._ensure_unit("range_x", "meter")
         range_y = self._ensure_unit("range_y", "meter")
         range_t = self._ensure_unit("range_t", "second")
 
-        x = np.linspace(range_x[0], range_x[1], self.parameters["num_x"].value)
-        y = np.linspace(range_y[0], range_y[1], self.parameters["num_y"].value)
-        t = np.linspace(range_t[0], range_t[1], self.parameters["num_t"].value)
+        x, y, t = _build_axes(
+            tuple(range_x),
+            self.parameters["num_x"].value,
+            tuple(range_y),
+            self.parameters["num_y"].value,
+            tuple(range_t),
+            self.parameters["num_t"].value,
+        )
 
         # Construct the pulse.
-        src = SASE_Source(
+        src = _BroadcastSASESource(
             x=x,
             y=y,
             t=t,
@@ -199,17 +844,159 @@ class PhenomSourceCalculator(BaseCalculator):
             theta_x=0.0,
             theta_y=0.0,
         )
+        src.use_gpu = bool(self.parameters["use_gpu"].value)
 
         key = self.output_keys[0]
-        filename = self.output_file_paths[0]
+        filename, out_path, save_loc = self._output_paths()
         output_data = self.output[key]
 
-        save_loc = str(Path(self.calculator_base_dir) / "sase_field.h5")
+        chunk_shape = self.parameters["chunk_shape"].value
+        if isinstance(chunk_shape, str) and chunk_shape == "auto":
+            chunk_shape = None
+        compression = self.parameters["compression"].value
+        if isinstance(compression, str) and compression == "none":
+            compression = None
 
-        src.generate_pulses(save_loc)
-        wfr = wpg_converter(save_loc, key = "pulse000")
-        wfr.store_hdf5(filename.format(key))
+        backend = self.parameters["backend"].value
+        if backend == "zarr" and not ZARR_AVAILABLE:
+            logger.warning(
+                'Cannot find the "zarr" module, writing the wavefront with the HDF5 backend.'
+            )
+            backend = "hdf5"
+
+        num_shots = self.parameters["num_shots"].value
+        if num_shots > 1:
+            self._run_shots(src, x, y, t, chunk_shape, compression, backend)
+            if backend == "zarr":
+                output_data.set_file(
+                    str(Path(filename).with_suffix(".zarr")), WPGZarrFormat
+                )
+            else:
+                output_data.set_file(filename, WPGFormat)
+            return self.output
+
+        # Evaluate the single pulse in memory and hand it to WPG directly;
+        # only the final wavefront file hits the disk.
+        efield = src.generate_sase_field(src.processes["pulse000"])
+        # The pulse is generated at complex128; narrowing (default
+        # complex64) halves the bandwidth of the wavefront write and of all
+        # downstream reads.
+        efield = efield.astype(np.dtype(self.parameters["dtype"].value), copy=False)
+        if self.parameters["save_intermediate"].value:
+            _write_sase_h5(
+                save_loc,
+                efield,
+                x,
+                y,
+                t,
+                src.processes["pulse000"],
+                chunk_shape,
+                compression,
+            )
+        wfr = _wavefront_from_array(efield, x, y, t, photon_energy)
+        if backend == "zarr":
+            _write_wavefront_zarr(
+                wfr,
+                str(Path(out_path).with_suffix(".zarr")),
+                chunk_shape,
+                "none" if compression is None else "blosc",
+            )
+            output_data.set_file(
+                str(Path(filename).with_suffix(".zarr")), WPGZarrFormat
+            )
+            return self.output
+        if self.parameters["fast_write"].value:
+            _write_wavefront_h5(wfr, out_path, chunk_shape, compression)
+        else:
+            wfr.store_hdf5(out_path)
+            _rechunk_time_sliced(
+                out_path,
+                ["data/arrEhor", "data/arrEver"],
+                chunk_shape,
+                compression,
+            )
 
         output_data.set_file(filename, WPGFormat)
 
         return self.output
+
+    def _run_shots(self, src, x, y, t, chunk_shape, compression, backend="hdf5"):
+        """Generate the shots of a multi-shot run, optionally in parallel.
+
+        With the HDF5 backend each shot gets its own wavefront file next to
+        the configured output file and the output file itself is written as a
+        master file of ``shot###`` external links. With the zarr backend the
+        shots are written as ``shot###`` groups of one zarr store, whose
+        directory layout lets the workers write concurrently without a
+        master-file step.
+
+        The registered output file is the master/root container: it indexes
+        the ensemble but holds no wavefront itself, so the format readers
+        refuse it with a pointer to the per-shot files.
+        """
+        num_shots = self.parameters["num_shots"].value
+        n_jobs = self.parameters["n_jobs"].value
+        dtype = self.parameters["dtype"].value
+        fast_write = self.parameters["fast_write"].value
+        use_gpu = src.use_gpu
+        pulse_params = src.processes["pulse000"]
+
+        out_path = Path(self._output_paths()[1])
+        if backend == "zarr":
+            root = out_path.with_suffix(".zarr")
+            # The root metadata is written once here; the workers only touch
+            # their own shot group below it.
+            zarr.open_group(str(root), mode="w")
+            shot_paths = [str(root / "shot{:03}".format(i)) for i in range(num_shots)]
+        else:
+            shot_paths = [
+                str(out_path.with_name("{}_{:03}{}".format(out_path.stem, i, out_path.suffix)))
+                for i in range(num_shots)
+            ]
+        # Independent spectral phases per shot, also across worker processes.
+        seeds = [int(s) for s in np.random.SeedSequence().generate_state(num_shots)]
+
+        if n_jobs != 1 and not JOBLIB_AVAILABLE:
+            logger.warning(
+                'Cannot find the "joblib" module, generating the shots serially.'
+            )
+        if n_jobs != 1 and JOBLIB_AVAILABLE:
+            Parallel(n_jobs=n_jobs, backend="loky")(
+                delayed(_run_one_shot)(
+                    pulse_params,
+                    x,
+                    y,
+                    t,
+                    dtype,
+                    path,
+                    chunk_shape,
+                    compression,
+                    fast_write,
+                    backend,
+                    use_gpu,
+                    seed,
+                )
+                for path, seed in zip(shot_paths, seeds)
+            )
+        else:
+            for path, seed in zip(shot_paths, seeds):
+                _run_one_shot(
+                    pulse_params,
+                    x,
+                    y,
+                    t,
+                    dtype,
+                    path,
+                    chunk_shape,
+                    compression,
+                    fast_write,
+                    backend,
+                    use_gpu,
+                    seed,
+                )
+
+        if backend == "zarr":
+            return
+        with h5py.File(str(out_path), "w") as h5:
+            for i, path in enumerate(shot_paths):
+                h5["shot{:03}".format(i)] = h5py.ExternalLink(Path(path).name, "/")
@@ -0,0 +1,118 @@
+""":module _phenom_kernel: Numba-fused evaluation of the phenom SASE pulse field."""
+import math
+import numpy as np
+
+# Numba is necessary for the fused kernel, but it's not a hard dependency of
+# SimExLite; callers fall back to NumPy broadcasting when it is unavailable.
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ModuleNotFoundError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _spatial_field(x, y, x0, y0, sigma, inv_4R, k, kx, ky, out):
+        """Complex gaussian beam times tilt phase, one value per transverse
+        point, written directly into ``out`` of shape (ny, nx)."""
+        ny = y.shape[0]
+        nx = x.shape[0]
+        inv_2sig2 = 1.0 / (2.0 * sigma * sigma)
+        for j in prange(ny):
+            dy = y[j] - y0
+            dy2 = dy * dy
+            ty = ky * y[j]
+            for i in range(nx):
+                dx = x[i] - x0
+                r2 = dx * dx + dy2
+                amplitude = math.exp(-r2 * inv_2sig2)
+                phase = -k * r2 * inv_4R + kx * x[i] + ty
+                out[j, i] = amplitude * complex(math.cos(phase), math.sin(phase))
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _outer_time(sfield, tfield, scale, out):
+        """``out[j, i, k] = sfield[j, i] * tfield[k] * scale`` without 3D
+        temporaries; each output voxel is written exactly once."""
+        ny, nx = sfield.shape
+        nt = tfield.shape[0]
+        for j in prange(ny):
+            for i in range(nx):
+                s = sfield[j, i] * scale
+                for k in range(nt):
+                    out[j, i, k] = s * tfield[k]
+
+
+def sase_field(
+    x,
+    y,
+    t,
+    tfield,
+    pulse_energy,
+    sigma,
+    div,
+    x0,
+    y0,
+    theta_x,
+    theta_y,
+    wavelength,
+    out=None,
+):
+    """Fused evaluation of the phenom SASE pulse field.
+
+    Computes the same (ny, nx, nt) complex field as
+    :func:`phenom.source.sase_pulse` from the 1D axes and the precomputed
+    temporal SASE spectrum ``tfield``, but with two numba kernels: one pass
+    over the (ny, nx) transverse plane and one pass writing each output voxel
+    once. The full-size intermediates of the NumPy evaluation (and its
+    normalization passes) are avoided; the normalization factors collapse
+    into one scalar because the field is separable in (x, y) and t.
+
+    Args:
+        x (np.ndarray): 1D horizontal axis. [m]
+        y (np.ndarray): 1D vertical axis. [m]
+        t (np.ndarray): 1D temporal axis. [s]
+        tfield (np.ndarray): Complex temporal SASE spectrum sampled on ``t``,
+            e.g. from :func:`phenom.spectrum.linear_SASE_spectrum`.
+        pulse_energy (float): Pulse energy. [J]
+        sigma (float): Gaussian beam width. [m]
+        div (float): Beam divergence. [rad]
+        x0, y0 (float): Transverse position jitter. [m]
+        theta_x, theta_y (float): Pointing angles. [rad]
+        wavelength (float): Central wavelength. [m]
+        out (np.ndarray, optional): Preallocated (ny, nx, nt) complex128
+            output array. Allocated when None.
+
+    Returns:
+        np.ndarray: The (ny, nx, nt) complex field.
+    """
+    if not NUMBA_AVAILABLE:
+        raise ModuleNotFoundError(
+            'Cannot find the "numba" module, which is required for the fused '
+            "SASE field kernel."
+        )
+    ny, nx, nt = y.size, x.size, t.size
+    if out is None:
+        out = np.empty((ny, nx, nt), dtype=np.complex128)
+
+    k = 2.0 * np.pi / wavelength
+    R = sigma / div
+    kx = 2.0 * np.pi * math.sin(theta_x) / wavelength
+    ky = 2.0 * np.pi * math.sin(theta_y) / wavelength
+
+    sfield = np.empty((ny, nx), dtype=np.complex128)
+    _spatial_field(x, y, x0, y0, sigma, 1.0 / (4.0 * R), k, kx, ky, sfield)
+
+    # phenom normalizes the spatial envelope, the (unit-magnitude) tilt and
+    # the full 3D field separately; combined into one scalar here. The tilt
+    # normalization cancels against the global one and drops out.
+    spatial_norm = np.sqrt(np.sum(sfield.real**2 + sfield.imag**2))
+    total_norm = np.sqrt(
+        np.sum(tfield.real**2 + tfield.imag**2) * np.ptp(x) * np.ptp(y) * np.ptp(t)
+    )
+    scale = pulse_energy / (spatial_norm * total_norm)
+
+    _outer_time(sfield, tfield, scale, out)
+    return out
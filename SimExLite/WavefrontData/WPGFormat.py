@@ -37,6 +37,12 @@ class WPGFormat(BaseFormat):
         # Reference : https://github.com/LUME-SIMEX/openPMD-wavefront/blob/master/scripts/wpg_to_opmd.py
         data_dict = {}
         with h5py.File(filename, "r") as h5:
+            if "data" not in h5 and any(name.startswith("shot") for name in h5):
+                raise ValueError(
+                    "{} is the master file of a multi-shot run and holds no wavefront "
+                    "itself; read the per-shot wavefront files its shot### external "
+                    "links point to instead.".format(filename)
+                )
             Ex = h5["data/arrEhor"][:, :, :, 0] + 1j * h5["data/arrEhor"][:, :, :, 1]
             Ey = h5["data/arrEver"][:, :, :, 0] + 1j * h5["data/arrEver"][:, :, :, 1]
             assert Ex.shape == Ey.shape
@@ -0,0 +1,196 @@
+import numpy as np
+from libpyvinyl.BaseFormat import BaseFormat
+from .WavefrontData import WavefrontData
+
+# zarr is necessary to read/write this format, but it's not a hard dependency of SimExLite.
+try:
+    import zarr
+    from zarr.codecs import BloscCodec
+
+    ZARR_AVAILABLE = True
+except ModuleNotFoundError:
+    ZARR_AVAILABLE = False
+
+
+def _check_zarr():
+    if not ZARR_AVAILABLE:
+        raise ModuleNotFoundError(
+            'Cannot find the "zarr" module, which is required to read/write WPGZarrFormat.'
+        )
+
+
+class WPGZarrFormat(BaseFormat):
+    """WPG wavefront data in a zarr directory store.
+
+    The layout mirrors :class:`WPGFormat`: the electric-field arrays are
+    stored as ``data/arrEhor``/``data/arrEver`` chunked per transverse time
+    slice, while the scalar metadata lives in the attributes of the
+    ``params`` and ``params/Mesh`` groups. Unlike HDF5, zarr stores every
+    chunk as its own file and Blosc compresses outside the GIL, so
+    independent processes can write chunks of a store concurrently.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @staticmethod
+    def data_type():
+        """Return the DataClass for which this FormatClass is working"""
+        return WavefrontData
+
+    @classmethod
+    def format_register(self):
+        key = "WPG_zarr"
+        description = "WPG zarr format for WavefrontData"
+        file_extension = ".zarr"
+        read_kwargs = [""]
+        write_kwargs = [""]
+        return self._create_format_register(
+            key, description, file_extension, read_kwargs, write_kwargs
+        )
+
+    @staticmethod
+    def direct_convert_formats():
+        return []
+
+    @classmethod
+    def read(cls, filename: str) -> dict:
+        """Read the data from the store with the `filename` to a dictionary."""
+        _check_zarr()
+        data_dict = {}
+        root = zarr.open_group(filename, mode="r")
+        if "data" not in root and any(
+            name.startswith("shot") for name in root.group_keys()
+        ):
+            raise ValueError(
+                "{0} is the root store of a multi-shot run and holds no wavefront "
+                "itself; read its shot### groups instead, e.g. {0}/shot000.".format(
+                    filename
+                )
+            )
+        Ex = root["data/arrEhor"][:, :, :, 0] + 1j * root["data/arrEhor"][:, :, :, 1]
+        Ey = root["data/arrEver"][:, :, :, 0] + 1j * root["data/arrEver"][:, :, :, 1]
+        assert Ex.shape == Ey.shape
+        data_dict["electricField"] = {}
+        data_dict["electricField"]["x"] = Ex
+        data_dict["electricField"]["y"] = Ey
+        params = root["params"].attrs
+        mesh = root["params/Mesh"].attrs
+        assert Ex.shape[0] == mesh["nx"]
+        assert Ex.shape[1] == mesh["ny"]
+        assert Ex.shape[2] == mesh["nSlices"]
+
+        data_dict["zCoordinate"] = mesh["zCoord"]
+        data_dict["radiusOfCurvatureX"] = params["Rx"]
+        data_dict["radiusOfCurvatureY"] = params["Ry"]
+        data_dict["deltaRadiusOfCurvatureX"] = params["dRx"]
+        data_dict["deltaRadiusOfCurvatureY"] = params["dRy"]
+        data_dict["photonEnergy"] = params["photonEnergy"]  # eV
+        data_dict["temporalDomain"] = str(params["wDomain"])
+        data_dict["spatialDomain"] = str(params["wSpace"])
+        data_dict["timeMin"] = mesh["sliceMin"]
+        data_dict["timeMax"] = mesh["sliceMax"]
+        data_dict["gridxMax"] = mesh["xMax"]
+        data_dict["gridxMin"] = mesh["xMin"]
+        data_dict["gridyMax"] = mesh["yMax"]
+        data_dict["gridyMin"] = mesh["yMin"]
+        data_dict["horizontalBaseVector"] = np.array(
+            (mesh["hvx"], mesh["hvy"], mesh["hvz"])
+        )
+        data_dict["normalBaseVector"] = np.array(
+            (mesh["nvx"], mesh["nvy"], mesh["nvz"])
+        )
+
+        return data_dict
+
+    @classmethod
+    def write(cls, object: WavefrontData, filename: str, key: str = None):
+        """Save the data with the `filename`."""
+        _check_zarr()
+        data_dict = object.get_data()
+        root = zarr.open_group(filename, mode="w")
+        Ex = data_dict["electricField"]["x"]
+        Ey = data_dict["electricField"]["y"]
+
+        data_grp = root.create_group("data")
+        for name, field in (("arrEhor", Ex), ("arrEver", Ey)):
+            arr = np.empty(field.shape + (2,), dtype=field.real.dtype)
+            arr[:, :, :, 0] = field.real
+            arr[:, :, :, 1] = field.imag
+            write_array(data_grp, name, arr)
+
+        params_grp = root.create_group("params")
+        params_grp.attrs.update(
+            {
+                "photonEnergy": data_dict["photonEnergy"],
+                "wDomain": data_dict["temporalDomain"],
+                "wSpace": data_dict["spatialDomain"],
+                "Rx": data_dict["radiusOfCurvatureX"],
+                "Ry": data_dict["radiusOfCurvatureY"],
+                "dRx": data_dict["deltaRadiusOfCurvatureX"],
+                "dRy": data_dict["deltaRadiusOfCurvatureY"],
+            }
+        )
+
+        mesh_grp = params_grp.create_group("Mesh")
+        mesh_grp.attrs.update(
+            {
+                "zCoord": data_dict["zCoordinate"],
+                "xMax": data_dict["gridxMax"],
+                "xMin": data_dict["gridxMin"],
+                "yMin": data_dict["gridyMin"],
+                "yMax": data_dict["gridyMax"],
+                "sliceMax": data_dict["timeMax"],
+                "sliceMin": data_dict["timeMin"],
+                "hvx": data_dict["horizontalBaseVector"][0],
+                "hvy": data_dict["horizontalBaseVector"][1],
+                "hvz": data_dict["horizontalBaseVector"][2],
+                "nvx": data_dict["normalBaseVector"][0],
+                "nvy": data_dict["normalBaseVector"][1],
+                "nvz": data_dict["normalBaseVector"][2],
+                "nx": Ex.shape[0],
+                "ny": Ex.shape[1],
+                "nSlices": Ex.shape[2],
+            }
+        )
+
+        info_grp = root.create_group("info")
+        info_grp.attrs["package_version"] = "Written by SimEx"
+
+        if key is None:
+            original_key = object.key
+            key = original_key + "_to_WPGZarrFormat"
+        return object.from_file(filename, cls, key)
+
+
+def write_array(group, name, arr, chunk_shape=None, compression="blosc"):
+    """Write a field array into a zarr group, chunked per transverse slice.
+
+    Args:
+        group (zarr.Group): The parent group.
+        name (str): The name of the array.
+        arr (np.ndarray): The array to store.
+        chunk_shape (tuple, optional): Explicit chunk shape. Trailing axes
+            not covered by the tuple are chunked with length 1. Defaults to
+            None, which chunks per transverse (ny, nx) slice.
+        compression (str, optional): "blosc" for Blosc/lz4 with byte
+            shuffling, or "none" to store the chunks raw. Defaults to
+            "blosc".
+
+    Returns:
+        zarr.Array: The stored array.
+    """
+    _check_zarr()
+    if chunk_shape is None:
+        chunks = arr.shape[:2] + (1,) * (arr.ndim - 2)
+    else:
+        chunks = tuple(chunk_shape) + (1,) * (arr.ndim - len(chunk_shape))
+    if compression is None or compression == "none":
+        compressors = None
+    else:
+        compressors = BloscCodec(cname="lz4", clevel=3, shuffle="shuffle")
+    out = group.create_array(
+        name, shape=arr.shape, dtype=arr.dtype, chunks=chunks, compressors=compressors
+    )
+    out[:] = arr
+    return out
@@ -1,2 +1,3 @@
 from .WavefrontData import WavefrontData
 from .WPGFormat import WPGFormat
+from .WPGZarrFormat import WPGZarrFormat
@@ -6,6 +6,7 @@ from SimExLite.DiffractionData.SingFELFormat import (
     getPatternShape,
     ireadPattern,
     getParameters,
+    rechunk_to_stack,
 )
 import matplotlib as mpl
 import matplotlib.pyplot as plt
@@ -147,6 +148,17 @@ def test_pattern_shape():
         print(my_shape)
 
 
+def test_rechunk_to_stack(tmp_path):
+    stacked_h5 = str(tmp_path / "stacked.h5")
+    rechunk_to_stack(h5_file, stacked_h5)
+    assert getPatternTotal(stacked_h5) == getPatternTotal(h5_file)
+    assert getPatternShape(stacked_h5) == getPatternShape(h5_file)
+    ref_dict = SingFELFormat.read(h5_file, poissonize=False)
+    stacked_dict = SingFELFormat.read(stacked_h5, poissonize=False)
+    assert np.array_equal(ref_dict["img_array"], stacked_dict["img_array"])
+    assert np.array_equal(ref_dict["quaternions"], stacked_dict["quaternions"])
+
+
 def test_iterator():
     my_iter = ireadPattern(h5_file, poissonize=True)
     n = 0